@@ -1,8 +1,157 @@
 #!/usr/bin/env python3
 
+import logging
+import mmap
+import os
 import re
+import stat
 import sys
 import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+
+logger = logging.getLogger(__name__)
+# Stay quiet unless the caller (or --debug) configures logging
+logger.addHandler(logging.NullHandler())
+_debug_handler = None
+
+try:
+    # Optional: RE2 scans in linear time, which pays off on large dumps
+    import re2
+except ImportError:
+    re2 = None
+
+# Patterns are compiled once at import time rather than on every call/table
+# MySQL cleanup in one pass: table options after ')', table option lines, then any backtick
+_CLEAN_MYSQL_RE = re.compile(
+    r'\)[\s`]*(?:ENGINE|CHARSET|COLLATE|AUTO_INCREMENT)[^;]*;'
+    r'|^[\s`]*(?:ENGINE|CHARSET|COLLATE|AUTO_INCREMENT)[^;]*;[\s`]*$'
+    r'|`',
+    re.MULTILINE | re.IGNORECASE
+)
+_SEMICOLON_RE = re.compile(r'\s*;')
+# Table-finding pass runs over the whole file, so prefer RE2 there when installed
+# RE2's \w is ASCII-only, so it gets an explicit Unicode class matching re's \w
+if re2 is not None:
+    _TABLE_RE = re2.compile(r"(?i)CREATE TABLE\s+([\p{L}\p{N}_]+)\s*\(")
+else:
+    _TABLE_RE = re.compile(r"CREATE TABLE\s+(\w+)\s*\(", re.IGNORECASE)
+# FOREIGN KEY (column) REFERENCES table (ref_column)
+_FK_RE = re.compile(r'FOREIGN KEY\s*\(([^)]+)\)\s+REFERENCES\s+([^(]+)\s*\(([^)]+)\)', re.IGNORECASE)
+_PK_RE = re.compile(r'PRIMARY KEY\s*\(([^)]+)\)', re.IGNORECASE)
+
+# Basic type mappings - using only Mermaid ERD compatible types.
+# Read-only so the cached map_sql_type_to_mermaid can never go stale.
+_TYPE_MAPPING = MappingProxyType({
+    'VARCHAR': 'VARCHAR',
+    'CHAR': 'CHAR',
+    'TEXT': 'VARCHAR',
+    'LONGTEXT': 'VARCHAR',
+    'MEDIUMTEXT': 'VARCHAR',
+    'TINYTEXT': 'VARCHAR',
+    'INT': 'INT',
+    'INTEGER': 'INT',
+    'BIGINT': 'INT',
+    'SMALLINT': 'INT',
+    'TINYINT': 'INT',
+    'DECIMAL': 'DECIMAL',
+    'FLOAT': 'FLOAT',
+    'DOUBLE': 'FLOAT',
+    'DATETIME': 'DATETIME',
+    'TIMESTAMP': 'DATETIME',
+    'DATE': 'DATE',
+    'TIME': 'TIME',
+    'YEAR': 'INT',
+    'BIT': 'BOOLEAN',
+    'BOOLEAN': 'BOOLEAN',
+    'BLOB': 'VARCHAR',
+    'LONGBLOB': 'VARCHAR',
+    'MEDIUMBLOB': 'VARCHAR',
+    'TINYBLOB': 'VARCHAR',
+    'JSON': 'VARCHAR',
+    'ENUM': 'VARCHAR',
+    'SET': 'VARCHAR'
+})
+
+# Only parentheses and commas matter when splitting a table body into definitions
+_STRUCTURE_RE = re.compile(r'[(),]')
+# Leading keywords of table-level definitions (anything else is a column candidate)
+_KEY_KEYWORDS = frozenset(['KEY', 'INDEX', 'UNIQUE', 'FULLTEXT', 'SPATIAL'])
+_CONSTRAINT_KEYWORDS = frozenset(['CONSTRAINT', 'CHECK'])
+_DEFINITION_KEYWORDS = _KEY_KEYWORDS | _CONSTRAINT_KEYWORDS | frozenset(['FOREIGN', 'PRIMARY'])
+# Data types that mark a segment as a column definition
+_COLUMN_TYPES = frozenset([
+    'VARCHAR', 'CHAR', 'NCHAR', 'NVARCHAR', 'TEXT', 'LONGTEXT', 'MEDIUMTEXT', 'TINYTEXT',
+    'INT', 'INTEGER', 'BIGINT', 'MEDIUMINT', 'SMALLINT', 'TINYINT', 'DECIMAL', 'FLOAT', 'DOUBLE',
+    'DATETIME', 'TIMESTAMP', 'DATE', 'TIME', 'YEAR', 'BIT', 'BOOLEAN',
+    'BLOB', 'LONGBLOB', 'MEDIUMBLOB', 'TINYBLOB', 'JSON', 'ENUM', 'SET', 'CITEXT',
+    'POINT', 'GEOMETRY', 'LINESTRING', 'POLYGON', 'MULTIPOINT', 'MULTILINESTRING', 'MULTIPOLYGON',
+    'GEOMETRYCOLLECTION', 'GEOMCOLLECTION'
+])
+_COLUMN_TYPE_ALTERNATION = "|".join(sorted(_COLUMN_TYPES, key=len, reverse=True))
+# Column name, then a type word starting with one of the types above, so variants such as
+# TIMESTAMPTZ, JSONB, VARCHAR2 or INT4 are still columns (unknown ones map to VARCHAR)
+_COLUMN_TYPE_RE = re.compile(
+    r"(\S+)\s+((?:" + _COLUMN_TYPE_ALTERNATION + r")[^\s(,]*)",
+    re.IGNORECASE
+)
+# A column whose name is a keyword (e.g. `key`) is told apart by an exact type as second word.
+# An identifier list after it means an index named after a type, e.g. KEY date (date);
+# sizes and ENUM/SET values (digits or quotes) still mean a column.
+_KEYWORD_COLUMN_RE = re.compile(
+    r"\S+\s+(?:" + _COLUMN_TYPE_ALTERNATION + r")\b(?!\s*\(\s*[^\s\d'\"])",
+    re.IGNORECASE
+)
+
+def read_sql_file(file_path):
+    """
+    Reads an SQL file by memory-mapping it and decoding straight from the mapping.
+    Avoids holding a separate bytes copy of the whole dump next to the decoded text.
+    Pipes, /dev/stdin and other unmappable inputs are read the ordinary way.
+    """
+    with open(file_path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        if stat.S_ISREG(st.st_mode) and st.st_size == 0:
+            return ''  # empty files cannot be mapped
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return f.read().decode('utf-8')
+        with mm:
+            return str(mm, 'utf-8')
+
+def _enable_debug_logging():
+    """
+    Turns on DEBUG logging for this module. Unless the caller has configured logging,
+    messages go to stdout as "[DEBUG] ...", like the rest of the debug output.
+    """
+    global _debug_handler
+    logger.setLevel(logging.DEBUG)
+    if _debug_handler is None and not logging.getLogger().handlers:
+        _debug_handler = logging.StreamHandler(sys.stdout)
+        _debug_handler.setFormatter(logging.Formatter("[%(levelname)s] %(message)s"))
+        logger.addHandler(_debug_handler)
+
+def _match_parentheses(sql_content):
+    """
+    Maps each opening parenthesis position to its matching closing one in a single stack pass.
+    """
+    open_to_close = {}
+    stack = []
+    for i, c in enumerate(sql_content):
+        if c == '(':
+            stack.append(i)
+        elif c == ')' and stack:
+            open_to_close[stack.pop()] = i
+    return open_to_close
+
+def _clean_mysql_match(m):
+    """
+    Replacement for _CLEAN_MYSQL_RE: options after ')' keep the closing ');', everything else is dropped.
+    """
+    return ');' if m.group(0)[0] == ')' else ''
 
 def clean_sql(sql_content, vendor="mysql", debug=False, debug_rows=100):
     """
@@ -13,263 +162,265 @@ def clean_sql(sql_content, vendor="mysql", debug=False, debug_rows=100):
     - Ensures every CREATE TABLE statement ends with a semicolon
     """
     if debug:
-        print(f"[DEBUG] Entering clean_sql (vendor={vendor}, debug_rows={debug_rows})")
+        _enable_debug_logging()
+    logger.debug("Entering clean_sql (vendor=%s, debug_rows=%d)", vendor, debug_rows)
     if vendor == "mysql":
-        # Remove all backticks
-        cleaned = sql_content.replace('`', '')
-        # Remove ENGINE, CHARSET, COLLATE, AUTO_INCREMENT lines after closing parenthesis
-        cleaned = re.sub(r'\)\s*(ENGINE|CHARSET|COLLATE|AUTO_INCREMENT)[^;]*;', ');', cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r'^\s*(ENGINE|CHARSET|COLLATE|AUTO_INCREMENT)[^;]*;\s*$', '', cleaned, flags=re.MULTILINE | re.IGNORECASE)
-        # Block-based approach to ensure every CREATE TABLE ends with a semicolon
-        blocks = cleaned.split('CREATE TABLE')
-        for i in range(1, len(blocks)):
-            block = blocks[i]
-            # Find the closing parenthesis that ends the CREATE TABLE definition
-            closing_paren = block.rfind(')')
-            if closing_paren != -1:
-                after_paren = block[closing_paren:]
-                # If there's no semicolon after the closing parenthesis, add it
-                if not after_paren.lstrip().startswith(';'):
-                    block = block[:closing_paren+1] + ';' + block[closing_paren+1:]
-                blocks[i] = block
-        cleaned = 'CREATE TABLE'.join(blocks)
-        if debug:
-            print(f"[DEBUG] First {debug_rows} lines of cleaned SQL:")
-            print("\n".join(cleaned.splitlines()[:debug_rows]))
-            print("[DEBUG] Exiting clean_sql")
+        # Remove all backticks and ENGINE, CHARSET, COLLATE, AUTO_INCREMENT options
+        cleaned = _CLEAN_MYSQL_RE.sub(_clean_mysql_match, sql_content)
+        # Ensure every CREATE TABLE ends with a semicolon: record insertion points
+        # after each matching closing parenthesis and join the pieces once
+        open_to_close = _match_parentheses(cleaned)
+        insert_points = set()
+        for match_table in _TABLE_RE.finditer(cleaned):
+            close_paren = open_to_close.get(match_table.end() - 1)
+            if close_paren is None:
+                continue
+            insert_at = close_paren + 1
+            # If there's no semicolon after the closing parenthesis, add it
+            if not _SEMICOLON_RE.match(cleaned, insert_at):
+                insert_points.add(insert_at)
+        if insert_points:
+            # Tables can close out of file order (e.g. a stray paren in a string
+            # literal), so slice at the sorted, de-duplicated positions
+            pieces = []
+            last = 0
+            for insert_at in sorted(insert_points):
+                pieces.append(cleaned[last:insert_at])
+                pieces.append(';')
+                last = insert_at
+            pieces.append(cleaned[last:])
+            cleaned = ''.join(pieces)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("First %d lines of cleaned SQL:\n%s", debug_rows, "\n".join(cleaned.splitlines()[:debug_rows]))
+        logger.debug("Exiting clean_sql")
         return cleaned
-    if debug:
-        print("[DEBUG] Exiting clean_sql (no vendor-specific cleaning)")
+    logger.debug("Exiting clean_sql (no vendor-specific cleaning)")
     return sql_content
 
 
 
-def map_sql_type_to_mermaid(sql_type, debug=False):
+@lru_cache(maxsize=256)
+def map_sql_type_to_mermaid(sql_type):
     """
     Maps SQL data types to Mermaid-compatible types.
+    Results are cached since real schemas reuse a handful of types.
     """
-    if debug:
-        print(f"[DEBUG] map_sql_type_to_mermaid: {sql_type}")
-    sql_type = sql_type.upper()
-    
-    # Basic type mappings - using only Mermaid ERD compatible types
-    type_mapping = {
-        'VARCHAR': 'VARCHAR',
-        'CHAR': 'CHAR',
-        'TEXT': 'VARCHAR',
-        'LONGTEXT': 'VARCHAR',
-        'MEDIUMTEXT': 'VARCHAR',
-        'TINYTEXT': 'VARCHAR',
-        'INT': 'INT',
-        'INTEGER': 'INT',
-        'BIGINT': 'INT',
-        'SMALLINT': 'INT',
-        'TINYINT': 'INT',
-        'DECIMAL': 'DECIMAL',
-        'FLOAT': 'FLOAT',
-        'DOUBLE': 'FLOAT',
-        'DATETIME': 'DATETIME',
-        'TIMESTAMP': 'DATETIME',
-        'DATE': 'DATE',
-        'TIME': 'TIME',
-        'YEAR': 'INT',
-        'BIT': 'BOOLEAN',
-        'BOOLEAN': 'BOOLEAN',
-        'BLOB': 'VARCHAR',
-        'LONGBLOB': 'VARCHAR',
-        'MEDIUMBLOB': 'VARCHAR',
-        'TINYBLOB': 'VARCHAR',
-        'JSON': 'VARCHAR',
-        'ENUM': 'VARCHAR',
-        'SET': 'VARCHAR'
-    }
-    
     # Extract base type (remove size specifications)
-    base_type = sql_type.split('(')[0] if '(' in sql_type else sql_type
-    mapped = type_mapping.get(base_type, 'VARCHAR')  # Default to VARCHAR if unknown
-    if debug:
-        print(f"[DEBUG] map_sql_type_to_mermaid: {sql_type} -> {mapped}")
-    return mapped
+    base_type = sql_type.upper().partition('(')[0]
+    return _TYPE_MAPPING.get(base_type, 'VARCHAR')  # Default to VARCHAR if unknown
 
-def parse_sql_to_mermaid_erd(sql_content, debug=False):
+def _split_definitions(text, pos=0, endpos=None):
     """
-    Parses SQL CREATE TABLE statements and generates Mermaid ERD syntax.
+    Yields the comma-separated definitions of a table body, ignoring commas nested in parentheses.
+    The body is text[pos:endpos]; it is scanned in place rather than sliced out first.
+    """
+    if endpos is None:
+        endpos = len(text)
+    depth = 0
+    start = pos
+    for m in _STRUCTURE_RE.finditer(text, pos, endpos):
+        c = m.group()
+        if c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+        elif depth == 0:
+            segment = text[start:m.start()].strip()
+            if segment:
+                yield segment
+            start = m.end()
+    segment = text[start:endpos].strip()
+    if segment:
+        yield segment
+
+def _tokenize_table_body(text, pos=0, endpos=None):
+    """
+    Splits a CREATE TABLE body (text[pos:endpos]) into typed definitions in a single
+    left-to-right scan. Commas only separate definitions at parenthesis depth 0, so
+    DECIMAL(10,2) and composite keys stay intact.
+
+    Yields:
+        ('COLUMN', definition, column_name, base_type)
+        ('PK', definition)
+        ('FK', column, ref_table, ref_column)
+        ('KEY', definition) / ('CONSTRAINT', definition)
+        ('SKIP', definition) for anything that is not recognised
+    """
+    for segment in _split_definitions(text, pos, endpos):
+        keyword = segment.split(None, 1)[0].partition('(')[0].upper()
+        if keyword in _DEFINITION_KEYWORDS and _KEYWORD_COLUMN_RE.match(segment):
+            keyword = None  # column named like a keyword
+        if keyword == 'FOREIGN' or keyword in _CONSTRAINT_KEYWORDS:
+            # Most constraints are FKs; a substring check on the short segment decides
+            # which clause regex is worth running (CHECK/UNIQUE run none)
+            upper = segment.upper()
+            fk = _FK_RE.search(segment) if 'FOREIGN KEY' in upper else None
+            if fk:
+                yield ('FK', fk.group(1).strip(), fk.group(2).strip(), fk.group(3).strip())
+                continue
+            if 'PRIMARY KEY' in upper and _PK_RE.search(segment):
+                yield ('PK', segment)
+                continue
+            yield ('CONSTRAINT', segment)
+        elif keyword == 'PRIMARY':
+            if _PK_RE.search(segment):
+                yield ('PK', segment)
+            else:
+                yield ('SKIP', segment)
+        elif keyword in _KEY_KEYWORDS:
+            yield ('KEY', segment)
+        else:
+            column = _COLUMN_TYPE_RE.match(segment)
+            if column:
+                yield ('COLUMN', segment, column.group(1), column.group(2))
+            else:
+                yield ('SKIP', segment)
+
+def _parse_one_table(text, table_name, pos=0, endpos=None):
+    """
+    Parses one CREATE TABLE body (text[pos:endpos]) into Mermaid columns and FK relationships.
+    Module-level so it can be shipped to worker processes.
+
+    Returns:
+        tuple: (table_name, [(column, mermaid_type, 'FK'/''), ...],
+                [(table, fk_column, ref_table, ref_column), ...])
+    """
+    logger.debug("Parsing table: %s", table_name)
+    cols = []
+    relationships = []
+    # (table, fk_column) pairs for constant-time FK lookups per column
+    fk_set = set()
+
+    # Single pass over the table body: columns, keys and constraints come out typed
+    column_definitions = []
+    for token in _tokenize_table_body(text, pos, endpos):
+        kind = token[0]
+        if kind == 'FK':
+            _, fk_column, ref_table, ref_column = token
+            relationships.append((table_name, fk_column, ref_table, ref_column))
+            fk_set.add((table_name, fk_column))
+            logger.debug("Found foreign key: %s.%s -> %s.%s", table_name, fk_column, ref_table, ref_column)
+        elif kind == 'PK':
+            # Primary keys are recognised but never flagged: the original parser reset
+            # its current_pk before reading it, so diagrams have never shown PK
+            logger.debug("Found primary key: %s", token[1])
+        elif kind == 'COLUMN':
+            column_definitions.append((token[2], token[3]))
+            logger.debug("Found column: %s", token[1])
+        else:
+            logger.debug("Skipping non-column definition: %.50s...", token[1])
+    # Process column definitions using the simplified approach
+    current_columns = []
+
+    # Name and base type were captured by the tokenizer's column match
+    for col_name, raw_type in column_definitions:
+        col_type = map_sql_type_to_mermaid(raw_type)
+        current_columns.append((col_name, col_type))
+        logger.debug("Added column: %s %s", col_name, col_type)
+
+    # Add columns to the table structure
+    for col_name, col_type in current_columns:
+        # Check if this column is also a foreign key
+        is_fk = (table_name, col_name) in fk_set
+
+        # Kept as (name, type, flag); formatted only when the diagram is written
+        if is_fk:
+            # If it's a foreign key, include the data type
+            cols.append((col_name, col_type, 'FK'))
+        else:
+            # Regular column with data type
+            cols.append((col_name, col_type, ''))
+    return table_name, cols, relationships
+
+def iter_mermaid_erd(sql_content, jobs=1, debug=False):
+    """
+    Parses SQL CREATE TABLE statements and yields the Mermaid ERD syntax line by line.
+    Each table block is yielded as soon as it is parsed, so callers can stream the diagram.
 
     Args:
         sql_content (str): The content of the SQL file containing CREATE TABLE statements.
+        jobs (int): Number of worker processes used to parse tables; 1 parses in-process.
+        debug (bool): Enable DEBUG logging for this module (printed to stdout by default).
 
-    Returns:
-        str: A string containing the Mermaid ERD syntax.
+    Yields:
+        str: Lines of Mermaid ERD syntax, without trailing newlines.
     """
     if debug:
-        print("[DEBUG] Entering parse_sql_to_mermaid_erd")
-        print("[DEBUG] SQL content at entry (first lines):")
-        print("\n".join(sql_content.splitlines()[:20]))
+        _enable_debug_logging()
+    logger.debug("Entering iter_mermaid_erd")
+    if logger.isEnabledFor(logging.DEBUG):
         import hashlib
-        print(f"[DEBUG] SQL content hash at entry: {hashlib.md5(sql_content.encode()).hexdigest()}")
-    mermaid_erd_lines = ["erDiagram"]
-    tables = {}
+        logger.debug("SQL content at entry (first lines):\n%s", "\n".join(sql_content.splitlines()[:20]))
+        logger.debug("SQL content hash at entry: %s", hashlib.md5(sql_content.encode()).hexdigest())
+    # Ordered for output, with a set alongside for duplicate checks
     relationships = []
+    relationship_set = set()
 
-    # Build parenthesis mapping for robust table extraction
-    paren_locs = []
-    for i, c in enumerate(sql_content):
-        if c == '(' or c == ')':
-            paren_locs.append((i, c))
+    open_to_close = _match_parentheses(sql_content)
     
-    # Build parenthesis pairs
-    stack = []
-    paren_pairs = []
-    for idx, c in paren_locs:
-        if c == '(':
-            stack.append(idx)
-        else:  # c == ')'
-            if stack:  # Check if stack is not empty
-                open_idx = stack.pop()
-                paren_pairs.append((open_idx, idx))
-    
-    if debug:
-        print(f"[DEBUG] Found {len(paren_pairs)} parenthesis pairs")
+    logger.debug("Found %d parenthesis pairs", len(open_to_close))
     
     # Find all CREATE TABLE statements
-    create_table_matches = re.finditer(r"CREATE TABLE\s+(\w+)\s*\(", sql_content, re.IGNORECASE)
-    
-    # Regex patterns split into simpler pieces for better maintainability
-    # Piece 1: Basic column name and type
-    basic_column_pattern = re.compile(r"^\s*(\w+)\s+([a-zA-Z]+(?:\(\d+(?:,\d+)?\))?)", re.IGNORECASE)
-    # Piece 2: Column modifiers
-    modifier_pattern = re.compile(r"(?:NOT NULL|DEFAULT\s+[^,]+|AUTO_INCREMENT)", re.IGNORECASE)
-    # Piece 3: Line end
-    line_end_pattern = re.compile(r",?\s*$")
-    pk_pattern = re.compile(r"PRIMARY KEY\s+\(?([a-zA-Z_][a-zA-Z0-9_]*)\)?", re.IGNORECASE)
-    fk_pattern = re.compile(r"FOREIGN KEY\s*\(([a-zA-Z_][a-zA-Z0-9_]*)\)\s+REFERENCES\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\(([a-zA-Z_][a-zA-Z0-9_]*)\)", re.IGNORECASE)
+    create_table_matches = _TABLE_RE.finditer(sql_content)
 
     matches = list(create_table_matches)
-    if debug:
-        print(f"[DEBUG] Number of CREATE TABLE matches found: {len(matches)}")
-        if not matches:
-            print("[WARNING] No CREATE TABLE statements found after cleaning!")
+    logger.debug("Number of CREATE TABLE matches found: %d", len(matches))
+    if not matches:
+        logger.warning("No CREATE TABLE statements found after cleaning!")
+    # (table_name, body_start, body_end) for every table with a balanced body
+    table_spans = []
     for match_table in matches:
         table_name = match_table.group(1)
         open_paren = match_table.end() - 1  # Position of the opening parenthesis
         
-        if debug:
-            print(f"[DEBUG] Parsing table: {table_name}")
-            print(f"[DEBUG] Opening parenthesis at position: {open_paren}")
+        logger.debug("Opening parenthesis for table %s at position: %d", table_name, open_paren)
         
         # Find the matching closing parenthesis using our mapping
-        close_paren = None
-        for start, end in paren_pairs:
-            if start == open_paren:
-                close_paren = end
-                break
+        close_paren = open_to_close.get(open_paren)
         
         if close_paren is None:
-            if debug:
-                print(f"[DEBUG] No matching closing parenthesis found for table {table_name}")
+            logger.debug("No matching closing parenthesis found for table %s", table_name)
             continue
         
-        # Extract the table body (everything between the parentheses)
-        columns_str = sql_content[open_paren+1:close_paren]
-        if debug:
-            print(f"[DEBUG] Table body length for {table_name}: {len(columns_str)}")
-            print(f"[DEBUG] Table body start: {columns_str[:100]}...")
-        tables[table_name] = []
-        # Apply simplified multi-pass approach to protect nested structures
-        table_body = columns_str
-        
-        # Step 1: First, let's extract FOREIGN KEY constraints before any replacements
-        # Look for patterns like: FOREIGN KEY (column) REFERENCES table (ref_column)
-        fk_pattern = r'FOREIGN KEY\s*\(([^)]+)\)\s+REFERENCES\s+([^(]+)\s*\(([^)]+)\)'
-        fk_matches = re.findall(fk_pattern, table_body, re.IGNORECASE)
-        for fk_match in fk_matches:
-            fk_column = fk_match[0].strip()
-            ref_table = fk_match[1].strip()
-            ref_column = fk_match[2].strip()
-            relationships.append((table_name, fk_column, ref_table, ref_column))
-            if debug:
-                print(f"[DEBUG] Found foreign key: {table_name}.{fk_column} -> {ref_table}.{ref_column}")
-        
-        # Step 2: Remove FOREIGN KEY constraints from table body to avoid confusion
-        table_body = re.sub(r'FOREIGN KEY\s*\([^)]+\)\s+REFERENCES\s+[^(]+\s*\([^)]+\),?', '', table_body, flags=re.IGNORECASE)
-        
-        # Step 3: Extract PRIMARY KEY constraints
-        pk_pattern = r'PRIMARY KEY\s*\(([^)]+)\)'
-        pk_matches = re.findall(pk_pattern, table_body, re.IGNORECASE)
-        for pk_match in pk_matches:
-            pk_columns = [col.strip() for col in pk_match.split(',')]
-            for pk_col in pk_columns:
-                if pk_col:
-                    current_pk = pk_col
-                    if debug:
-                        print(f"[DEBUG] Found primary key: {current_pk}")
-        
-        # Step 4: Remove PRIMARY KEY constraints from table body
-        table_body = re.sub(r'PRIMARY KEY\s*\([^)]+\),?', '', table_body, flags=re.IGNORECASE)
-        
-        # Step 5: Remove KEY/INDEX definitions
-        table_body = re.sub(r'KEY\s+[^(]*\([^)]+\),?', '', table_body, re.IGNORECASE)
-        
-        # Step 6: Remove CONSTRAINT definitions
-        table_body = re.sub(r'CONSTRAINT\s+[^,]+', '', table_body, re.IGNORECASE)
-        
-        if debug:
-            print(f"[DEBUG] Table body after replacements for {table_name}:")
-            print(f"[DEBUG] {table_body[:200]}...")
-        
-        # Step 7: Now safe to split by comma (constraints have been removed)
-        comma_separated = [defn.strip() for defn in table_body.split(',') if defn.strip()]
-        if debug:
-            print(f"[DEBUG] Comma-separated parts for {table_name}:")
-            for i, part in enumerate(comma_separated, 1):
-                print(f"[DEBUG]   {i}. {part[:60]}...")
-        
-        # Step 8: Process each part - now only column definitions should remain
-        column_definitions = []
-        for definition in comma_separated:
-            # Check if this looks like a column definition (has a data type)
-            if any(data_type in definition.lower() for data_type in ['varchar', 'char', 'int', 'datetime', 'longtext', 'bit', 'decimal', 'float', 'double', 'date', 'time', 'timestamp', 'year', 'boolean', 'blob', 'json', 'enum', 'set', 'text']):
-                column_definitions.append(definition)
-                if debug:
-                    print(f"[DEBUG] Found column: {definition}")
-            else:
-                if debug:
-                    print(f"[DEBUG] Skipping non-column definition: {definition[:50]}...")
-        # Process column definitions using the simplified approach
-        current_columns = []
-        current_pk = None
-        
-        for definition in column_definitions:
-            # Extract column name and type from the definition
-            # Format: column_name data_type(size) modifiers
-            parts = definition.split()
-            if len(parts) >= 2:
-                col_name = parts[0]
-                raw_type = parts[1].split('(')[0]  # Remove size specification
-                col_type = map_sql_type_to_mermaid(raw_type, debug=debug)
-                current_columns.append((col_name, col_type))
-                if debug:
-                    print(f"[DEBUG] Added column: {col_name} {col_type}")
-
-        # Add columns to the table structure
-        for col_name, col_type in current_columns:
-            # Check if this column is also a foreign key
-            is_fk = any(r[0] == table_name and r[1] == col_name for r in relationships)
-            is_pk = col_name == current_pk
-            
-            if is_fk:
-                # If it's a foreign key, include the data type
-                tables[table_name].append(f"{col_name} {col_type} FK")
-            else:
-                # Regular column with data type
-                pk_suffix = " PK" if is_pk else ""
-                tables[table_name].append(f"{col_name} {col_type}{pk_suffix}")
+        # The table body is everything between the parentheses; it is scanned in place
+        body_start = open_paren + 1
+        logger.debug("Table body length for %s: %d", table_name, close_paren - body_start)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Table body start: %s...", sql_content[body_start:min(body_start + 100, close_paren)])
+        table_spans.append((table_name, body_start, close_paren))
+
+    # Tables are independent, so large schemas can be spread over worker processes.
+    # Workers get only their own body; map() keeps the results in file order.
+    executor = None
+    if jobs > 1 and len(table_spans) > 1:
+        executor = ProcessPoolExecutor(max_workers=jobs)
+        results = executor.map(
+            _parse_one_table,
+            [sql_content[start:end] for _, start, end in table_spans],
+            [table_name for table_name, _, _ in table_spans],
+            chunksize=max(1, len(table_spans) // (jobs * 4))
+        )
+    else:
+        results = (_parse_one_table(sql_content, table_name, start, end) for table_name, start, end in table_spans)
 
-    # Generate Mermaid ERD table definitions
-    for table_name, cols in tables.items():
-        mermaid_erd_lines.append(f"{table_name} {{")
-        mermaid_erd_lines.extend(cols)
-        mermaid_erd_lines.append("}")
+    yield "erDiagram"
+
+    # Generate Mermaid ERD table definitions as each table is parsed;
+    # only the relationships are held until the end
+    try:
+        for table_name, cols, table_relationships in results:
+            yield f"{table_name} {{"
+            for col_name, col_type, flag in cols:
+                yield f"{col_name} {col_type} {flag}" if flag else f"{col_name} {col_type}"
+            yield "}"
+            # Re-declared FKs would otherwise print the same relationship line twice
+            for relationship in table_relationships:
+                if relationship not in relationship_set:
+                    relationship_set.add(relationship)
+                    relationships.append(relationship)
+    finally:
+        if executor is not None:
+            executor.shutdown()
 
     # Generate Mermaid ERD relationships
     for from_table, from_col, to_table, to_col in relationships:
@@ -279,16 +430,56 @@ def parse_sql_to_mermaid_erd(sql_content, debug=False):
         # ||--o{ means one-to-zero-or-many
         # |o--o| means zero-or-one-to-zero-or-one
         # Let's use ||--o{ as a common default for FKs
-        mermaid_erd_lines.append(f"{from_table} ||--o{{ {to_table} : \"FK to {to_col}\"")
-    if debug:
-        print("[DEBUG] Exiting parse_sql_to_mermaid_erd")
-    return "\n".join(mermaid_erd_lines)
+        yield f"{from_table} ||--o{{ {to_table} : \"FK to {to_col}\""
+    logger.debug("Exiting iter_mermaid_erd")
+
+def parse_sql_to_mermaid_erd(sql_content, debug=False, jobs=1):
+    """
+    Parses SQL CREATE TABLE statements and generates Mermaid ERD syntax.
+
+    Args:
+        sql_content (str): The content of the SQL file containing CREATE TABLE statements.
+        debug (bool): Enable DEBUG logging for this module (printed to stdout by default).
+        jobs (int): Number of worker processes used to parse tables; 1 parses in-process.
+
+    Returns:
+        str: A string containing the Mermaid ERD syntax.
+    """
+    return "\n".join(iter_mermaid_erd(sql_content, jobs=jobs, debug=debug))
+
+def write_mermaid_file(file_path, mermaid_lines):
+    """
+    Streams Mermaid ERD lines into a fenced ```mermaid block at file_path.
+    Writes to a temporary file in the same directory and moves it over the target
+    only once every line is written, so a parse error never leaves a half-written file.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    try:
+        mode = stat.S_IMODE(os.stat(file_path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    with tempfile.NamedTemporaryFile('w', dir=directory, prefix='.' + os.path.basename(file_path) + '.',
+                                     suffix='.tmp', delete=False) as f:
+        tmp_path = f.name
+        try:
+            f.write("```mermaid\n")
+            f.writelines(f"{line}\n" for line in mermaid_lines)
+            f.write("```\n")
+        except BaseException:
+            f.close()
+            os.unlink(tmp_path)
+            raise
+    os.chmod(tmp_path, mode)
+    os.replace(tmp_path, file_path)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Convert SQL CREATE TABLE statements to Mermaid ERD.")
     parser.add_argument("input_sql_file", help="Input SQL file path")
     parser.add_argument("output_mermaid_file", nargs="?", help="Output Mermaid file path (optional)")
     parser.add_argument("--debug", action="store_true", help="Enable debug output")
+    parser.add_argument("--jobs", type=int, default=1, help="Number of worker processes for parsing tables (default: 1)")
     parser.add_argument("--debug-rows", type=int, default=100, help="Number of lines to show in debug output (default: 100)")
     args = parser.parse_args()
 
@@ -298,30 +489,32 @@ if __name__ == "__main__":
     debug_rows = args.debug_rows
 
     if debug:
+        # Route module debug logging to stdout alongside the rest of the debug output
+        _enable_debug_logging()
         print(f"[DEBUG] Arguments: input_file_path={input_file_path}, output_file_path={output_file_path}, debug={debug}, debug_rows={debug_rows}")
 
     try:
-        with open(input_file_path, 'r') as f:
-            sql_content = f.read()
+        sql_content = read_sql_file(input_file_path)
         if debug:
             print("[DEBUG] Read input SQL file")
         sql_content = clean_sql(sql_content, vendor="mysql", debug=debug, debug_rows=debug_rows)
         if debug:
-            print("[DEBUG] Cleaned SQL content (before parse_sql_to_mermaid_erd):")
+            print("[DEBUG] Cleaned SQL content (before iter_mermaid_erd):")
             print("\n".join(sql_content.splitlines()[:debug_rows]))
             import hashlib
             print(f"[DEBUG] Cleaned SQL hash: {hashlib.md5(sql_content.encode()).hexdigest()}")
-        mermaid_output = parse_sql_to_mermaid_erd(sql_content, debug=debug)
-        if debug:
-            print("[DEBUG] Parsed Mermaid ERD")
+        # Stream the diagram out as it is generated rather than building it in memory
+        mermaid_lines = iter_mermaid_erd(sql_content, jobs=args.jobs)
         if output_file_path:
-            with open(output_file_path, 'w') as f:
-                f.write("```mermaid\n")
-                f.write(mermaid_output)
-                f.write("\n```\n")
+            write_mermaid_file(output_file_path, mermaid_lines)
+            if debug:
+                print("[DEBUG] Parsed Mermaid ERD")
             print(f"Mermaid ERD saved to: {output_file_path}")
         else:
-            print(mermaid_output)
+            for line in mermaid_lines:
+                print(line)
+            if debug:
+                print("[DEBUG] Parsed Mermaid ERD")
 
     except FileNotFoundError:
         print(f"Error: Input file not found at '{input_file_path}'")